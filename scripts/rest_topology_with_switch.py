@@ -6,9 +6,16 @@ from ryu.ofproto import ofproto_v1_3
 from ryu.lib.packet import packet
 from ryu.lib.packet import ethernet
 from ryu.lib.packet import ether_types
+from ryu.lib import hub
 from ryu.app.wsgi import WSGIApplication, ControllerBase, Response, route
+from ryu.topology import event
 from ryu.topology.api import get_switch, get_link
 import json
+import threading
+from collections import OrderedDict
+
+MAC_TO_PORT_LOCK_STRIPES = 16  # Must be a power of two
+INSTALLED_FLOWS_MAX = 1024  # Recently installed Packet-In flows remembered to skip re-installs
 
 class RestTopology(app_manager.RyuApp):
     OFP_VERSIONS = [ofproto_v1_3.OFP_VERSION]
@@ -19,8 +26,18 @@ class RestTopology(app_manager.RyuApp):
 
     def __init__(self, *args, **kwargs):
         super(RestTopology, self).__init__(*args, **kwargs)
-        self.mac_to_port = {}  # Track MAC-to-port mappings
+        self.mac_to_port = {}  # Track MAC-to-port mappings, keyed by (dpid, mac)
         self.hosts = {}  # Track hosts and their connected switches/ports
+        # Striped locks so Packet-Ins from different switches rarely contend
+        self.mac_to_port_locks = [threading.Lock() for _ in range(MAC_TO_PORT_LOCK_STRIPES)]
+        self.hosts_lock = threading.Lock()
+        # LRU of (dpid, in_port, src, dst, out_port) flows installed from Packet-Ins
+        self.installed_flows = OrderedDict()
+        self.installed_flows_lock = threading.Lock()
+        # Serialized switches/links REST bodies, rebuilt only after a topology event
+        self.topology_dirty = True
+        self.topology_bodies = None  # (switches_body, links_body), swapped as one pair
+        self.topology_bodies_lock = hub.Semaphore()
         wsgi = kwargs['wsgi']
         wsgi.register(RestTopologyController, {'topology_app': self})
 
@@ -30,12 +47,31 @@ class RestTopology(app_manager.RyuApp):
         ofproto = datapath.ofproto
         parser = datapath.ofproto_parser
 
+        # Forget flows installed before the switch (re)connected, its flow table starts empty
+        with self.installed_flows_lock:
+            for key in [key for key in self.installed_flows if key[0] == datapath.id]:
+                del self.installed_flows[key]
+
         # Install a default table-miss flow entry
         match = parser.OFPMatch()
         actions = [parser.OFPActionOutput(ofproto.OFPP_CONTROLLER,
                                           ofproto.OFPCML_NO_BUFFER)]
         self.add_flow(datapath, 0, match, actions)
 
+    def _mac_to_port_lock(self, dpid):
+        return self.mac_to_port_locks[dpid & (MAC_TO_PORT_LOCK_STRIPES - 1)]
+
+    def _flow_recently_installed(self, key):
+        """Check and record a Packet-In flow in the LRU of installed flows."""
+        with self.installed_flows_lock:
+            if key in self.installed_flows:
+                self.installed_flows.move_to_end(key)
+                return True
+            self.installed_flows[key] = None
+            if len(self.installed_flows) > INSTALLED_FLOWS_MAX:
+                self.installed_flows.popitem(last=False)
+            return False
+
     def add_flow(self, datapath, priority, match, actions):
         ofproto = datapath.ofproto
         parser = datapath.ofproto_parser
@@ -46,6 +82,35 @@ class RestTopology(app_manager.RyuApp):
                                 match=match, instructions=inst)
         datapath.send_msg(mod)
 
+    @set_ev_cls([event.EventSwitchEnter, event.EventSwitchLeave,
+                 event.EventLinkAdd, event.EventLinkDelete])
+    def _topology_change_handler(self, ev):
+        self.topology_dirty = True
+
+    def get_topology_bodies(self):
+        """Return the (switches, links) REST bodies, re-serializing them if the topology changed."""
+        # get_switch/get_link yield while waiting for the switches app, so concurrent
+        # readers wait here for the rebuild instead of serving stale or missing bodies
+        with self.topology_bodies_lock:
+            if self.topology_dirty or self.topology_bodies is None:
+                # Cleared before reading so an event arriving meanwhile triggers another rebuild
+                self.topology_dirty = False
+
+                switches = get_switch(self)
+                switches_body = json.dumps([switch.dp.id for switch in switches])
+
+                links = get_link(self)
+                link_list = []
+                for link in links:
+                    link_list.append({
+                        "src": {"dpid": link.src.dpid, "port_no": link.src.port_no},
+                        "dst": {"dpid": link.dst.dpid, "port_no": link.dst.port_no}
+                    })
+                links_body = json.dumps(link_list)
+
+                self.topology_bodies = (switches_body, links_body)
+            return self.topology_bodies
+
     @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
     def _packet_in_handler(self, ev):
         msg = ev.msg
@@ -64,28 +129,29 @@ class RestTopology(app_manager.RyuApp):
         dst = eth.dst
         src = eth.src
         dpid = datapath.id
-        self.mac_to_port.setdefault(dpid, {})
 
         self.logger.info("packet in %s %s %s %s", dpid, src, dst, in_port)
 
-        # Learn MAC address to avoid flooding next time
-        self.mac_to_port[dpid][src] = in_port
+        with self._mac_to_port_lock(dpid):
+            # Learn MAC address to avoid flooding next time
+            self.mac_to_port[(dpid, src)] = in_port
+
+            out_port = self.mac_to_port.get((dpid, dst), ofproto.OFPP_FLOOD)
 
         # Register the host and its connection
-        if src not in self.hosts:
-            self.hosts[src] = {"attached_switch": str(dpid), "attached_port": str(in_port)}
+        with self.hosts_lock:
+            new_host = src not in self.hosts
+            if new_host:
+                self.hosts[src] = {"attached_switch": str(dpid), "attached_port": str(in_port)}
+        if new_host:
             self.logger.info("Host %s connected to switch %s, port %s", src, dpid, in_port)
 
-        if dst in self.mac_to_port[dpid]:
-            out_port = self.mac_to_port[dpid][dst]
-        else:
-            out_port = ofproto.OFPP_FLOOD
-
         actions = [parser.OFPActionOutput(out_port)]
 
-        # Install a flow rule to avoid Packet-In next time
-        match = parser.OFPMatch(in_port=in_port, eth_dst=dst, eth_src=src)
-        self.add_flow(datapath, 1, match, actions)
+        # Install a flow rule to avoid Packet-In next time, unless a burst already did
+        if not self._flow_recently_installed((dpid, in_port, src, dst, out_port)):
+            match = parser.OFPMatch(in_port=in_port, eth_dst=dst, eth_src=src)
+            self.add_flow(datapath, 1, match, actions)
 
         data = None
         if msg.buffer_id == ofproto.OFP_NO_BUFFER:
@@ -103,25 +169,19 @@ class RestTopologyController(ControllerBase):
 
     @route('topology', '/v1.0/topology/switches', methods=['GET'])
     def list_switches(self, req, **kwargs):
-        switches = get_switch(self.topology_app)
-        body = json.dumps([switch.dp.id for switch in switches])
-        return Response(content_type='application/json', body=body)
+        switches_body, _ = self.topology_app.get_topology_bodies()
+        return Response(content_type='application/json', body=switches_body)
 
     @route('topology', '/v1.0/topology/links', methods=['GET'])
     def list_links(self, req, **kwargs):
-        links = get_link(self.topology_app)
-        link_list = []
-        for link in links:
-            link_list.append({
-                "src": {"dpid": link.src.dpid, "port_no": link.src.port_no},
-                "dst": {"dpid": link.dst.dpid, "port_no": link.dst.port_no}
-            })
-        body = json.dumps(link_list)
-        return Response(content_type='application/json', body=body)
+        _, links_body = self.topology_app.get_topology_bodies()
+        return Response(content_type='application/json', body=links_body)
 
     @route('topology', '/v1.0/topology/hosts', methods=['GET'])
     def list_hosts(self, req, **kwargs):
         """Return dynamically discovered host information."""
-        hosts = self.topology_app.hosts
+        # Copy under the lock so Packet-In handlers can keep registering hosts
+        with self.topology_app.hosts_lock:
+            hosts = dict(self.topology_app.hosts)
         body = json.dumps(hosts)
         return Response(content_type='application/json', body=body)
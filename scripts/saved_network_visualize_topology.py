@@ -1,53 +1,121 @@
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import json
 import os
 import threading
-import queue
 import time
 import sys
-import select
+import selectors
+
+try:
+    import orjson  # Optional C-level JSON parser, much faster than the json module
+except ImportError:
+    orjson = None
 
 RYU_API = "http://127.0.0.1:8080"
 TOPOLOGY_API = f"{RYU_API}/v1.0/topology"
 SNAPSHOT_FILE = os.path.join(os.path.dirname(__file__), "snapshot.json")
 
+# Reusing one keep-alive session and worker pool for all REST calls
+SESSION = requests.Session()
+SESSION.headers["Accept-Encoding"] = "gzip"
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+REQUEST_TIMEOUT = 2  # Seconds to wait for RYU before giving up on a fetch
+FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=3)
+
+
+class LatestQueue:
+    """Single-slot queue that only keeps the newest item, so a stalled consumer cannot pile up updates."""
+
+    def __init__(self):
+        self._item = None
+        self._condition = threading.Condition()
+
+    def put(self, item):
+        """Replacing any pending item with the new one."""
+        with self._condition:
+            self._item = item
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """Taking the pending item, or returning None if nothing arrives within the timeout."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._item is not None, timeout)
+            item, self._item = self._item, None
+            return item
+
+
 stop_real_time = threading.Event()
-fetch_queue = queue.Queue()
+fetch_queue = LatestQueue()
+
+# Pipe used by the fetcher to wake up the main loop after queuing an update
+wakeup_read_fd, wakeup_write_fd = os.pipe()
+os.set_blocking(wakeup_write_fd, False)
+
 initial_host_mapping = None
 initial_switch_links = None
 
+# Caching the last drawn topology and its layout between redraws
+last_topology_signature = None
+cached_layout = None
+cached_layout_nodes = None
+
+# Keeping handles to the drawn figure so that edge-only changes can be blitted
+figure_artists = None
+
+# Caching the deduplicated links keyed by a fingerprint of the raw REST data
+dedup_cache = (None, None)
+
+
+def parse_json(data):
+    """Parsing a JSON document from bytes, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def fetch_all(include_hosts=True):
+    """
+    Fetching switches, links and hosts from RYU's REST API concurrently.
+    With include_hosts=False only switches and links are requested and hosts is returned as None.
+    """
+    # Issuing all requests at once so a fetch costs one round trip
+    switches_future = FETCH_EXECUTOR.submit(SESSION.get, f"{TOPOLOGY_API}/switches", timeout=REQUEST_TIMEOUT)
+    links_future = FETCH_EXECUTOR.submit(SESSION.get, f"{TOPOLOGY_API}/links", timeout=REQUEST_TIMEOUT)
+    if include_hosts:
+        hosts_future = FETCH_EXECUTOR.submit(SESSION.get, f"{TOPOLOGY_API}/hosts", timeout=REQUEST_TIMEOUT)
 
-def fetch_topology():
-    """Fetching switches and links from RYU's REST API."""
     try:
-        switches = requests.get(f"{TOPOLOGY_API}/switches").json()
-        links = requests.get(f"{TOPOLOGY_API}/links").json()
-        return switches, links
+        switches = parse_json(switches_future.result().content)
+        links = parse_json(links_future.result().content)
     except Exception as e:
         print(f"Error fetching topology: {e}")
-        return [], []
+        switches, links = [], []
 
+    if not include_hosts:
+        return switches, links, None
 
-def fetch_hosts():
-    """Fetching hosts from RYU's REST API and format them properly."""
     try:
-        response = requests.get(f"{TOPOLOGY_API}/hosts")
+        response = hosts_future.result()
         response.raise_for_status()
-        hosts_data = response.json()
+        hosts_data = parse_json(response.content)
         hosts = []
         for mac, info in hosts_data.items():
             hosts.append({
                 "mac": mac,
-                "attached_switch": info["attached_switch"],
-                "attached_port": info["attached_port"],
+                "attached_switch": int(info["attached_switch"]),
+                "attached_port": int(info["attached_port"]),
             })
-
-        return hosts
     except Exception as e:
         print(f"Error fetching hosts: {e}")
-        return []
+        hosts = []
+
+    return switches, links, hosts
 
 
 def save_snapshot(switches, links, host_links):
@@ -57,54 +125,70 @@ def save_snapshot(switches, links, host_links):
         "links": links,
         "host_links": host_links,
     }
-    with open(SNAPSHOT_FILE, "w") as f:
-        json.dump(snapshot, f, indent=2)
+    with open(SNAPSHOT_FILE, "wb") as f:
+        if orjson is not None:
+            f.write(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+        else:
+            f.write(json.dumps(snapshot, indent=2).encode())
     print(f"Snapshot saved to {SNAPSHOT_FILE}")
 
 
 def load_snapshot():
     """Loading topology and traffic data from a JSON file."""
     try:
-        with open(SNAPSHOT_FILE, "r") as f:
-            snapshot = json.load(f)
+        with open(SNAPSHOT_FILE, "rb") as f:
+            snapshot = parse_json(f.read())
             return snapshot["switches"], snapshot["links"], snapshot["host_links"]
     except Exception as e:
         print(f"Error loading snapshot: {e}")
         return [], [], []
 
 
+def links_signature(links):
+    """Computing a cheap fingerprint of the raw links returned by RYU."""
+    return hash(tuple(
+        (link["src"]["dpid"], link["src"]["port_no"], link["dst"]["dpid"], link["dst"]["port_no"])
+        for link in links
+    ))
+
+
 def deduplicate_links(links):
     """Deduplicating bidirectional links to consider them as one."""
-    unique_links = set()
+    global dedup_cache
+    signature = links_signature(links)
+    if dedup_cache[0] == signature:
+        return dedup_cache[1]
+
+    # Keying by the unordered pair of endpoints, keeping the first-seen direction in insertion order
+    unique_links = {}
     for link in links:
         src = (link["src"]["dpid"], link["src"]["port_no"])
         dst = (link["dst"]["dpid"], link["dst"]["port_no"])
-        unique_links.add(tuple(sorted((src, dst))))
-    return list(unique_links)
+        key = frozenset((src, dst))
+        if key not in unique_links:
+            unique_links[key] = (src, dst)
+    dedup_cache = (signature, list(unique_links.values()))
+    return dedup_cache[1]
 
 
-def filter_host_links(links, hosts):
-    """Filtering host-to-switch links."""
+def get_switch_ports(links):
+    """Collecting the ports used by switch-to-switch links, per switch."""
     switch_ports = {}
     for link in links:
-        src_dpid = link["src"]["dpid"]
-        src_port = link["src"]["port_no"]
-        dst_dpid = link["dst"]["dpid"]
-        dst_port = link["dst"]["port_no"]
+        switch_ports.setdefault(link["src"]["dpid"], set()).add(link["src"]["port_no"])
+        switch_ports.setdefault(link["dst"]["dpid"], set()).add(link["dst"]["port_no"])
+    return switch_ports
 
-        if src_dpid not in switch_ports:
-            switch_ports[src_dpid] = set()
-        if dst_dpid not in switch_ports:
-            switch_ports[dst_dpid] = set()
 
-        switch_ports[src_dpid].add(src_port)
-        switch_ports[dst_dpid].add(dst_port)
+def filter_host_links(links, hosts):
+    """Filtering host-to-switch links."""
+    switch_ports = get_switch_ports(links)
 
     host_links = []
     host_counter = 1
-    for host in sorted(hosts, key=lambda h: (int(h["attached_switch"]), int(h["attached_port"]))):
-        switch_id = int(host["attached_switch"])
-        port_no = int(host["attached_port"])
+    for host in sorted(hosts, key=itemgetter("attached_switch", "attached_port")):
+        switch_id = host["attached_switch"]
+        port_no = host["attached_port"]
 
         if switch_id not in switch_ports or port_no not in switch_ports[switch_id]:
             host_name = f"h{host_counter}"
@@ -119,104 +203,94 @@ def filter_host_links(links, hosts):
     return host_links
 
 
-def remove_link(G, source, destination, switches, links, host_links, all_hosts):
-    """Removing a link from the graph."""
-    try:
-        if source.startswith("h"):  # Source is a host
-            src = source
-        else:  # Source is a switch
-            src = int(source)
-
-        if destination.startswith("h"):  # Destination is a host
-            dst = destination
-        else:  # Destination is a switch
-            dst = int(destination)
-
-        # Checking and removing link
-        if G.has_edge(src, dst):
-            G.remove_edge(src, dst)
-            print(f"Link removed: {src} <-> {dst}")
-
-            # Updating topology data
-            if isinstance(src, int) and isinstance(dst, int):  # Switch-to-switch link
-                links[:] = [
-                    link for link in links if not ({link[0][0], link[1][0]} == {src, dst})
-                ]
-            elif isinstance(src, str) or isinstance(dst, str):  # Host-to-switch link
-                host_links[:] = [
-                    link for link in host_links
-                    if not ((link["host_name"] == src and link["switch_dpid"] == dst) or
-                            (link["host_name"] == dst and link["switch_dpid"] == src))
-                ]
-
-                # Ensuring the host remains in the graph
-                if isinstance(src, str) and src in all_hosts:
-                    G.add_node(src)
-                if isinstance(dst, str) and dst in all_hosts:
-                    G.add_node(dst)
-
-            # Redrawing updated graph
-            visualize_topology(G, switches, links, host_links)
-        else:
-            print("Link does not exist in the current topology.")
-    except ValueError:
-        print("Invalid input. Switch IDs must be integers, and host IDs must start with 'h'.")
+def index_switch_links(links):
+    """Indexing switch-to-switch links by the unordered pair of switches they connect."""
+    return {frozenset((link[0][0], link[1][0])): link for link in links}
 
 
-def add_link(G, source, destination, switches, links, host_links, host_links_snapshot):
-    """Adding a link to the graph."""
-    global initial_switch_links
-    try:
-        if source.startswith("h"):  # Source is a host
-            src = source
-        else:  # Source is a switch
-            src = int(source)
-
-        if destination.startswith("h"):  # Destination is a host
-            dst = destination
-        else:  # Destination is a switch
-            dst = int(destination)
-
-        # Checking if the link exists in the original topology or snapshot
-        is_valid_link = False
-        port_no = None
-        if isinstance(src, int) and isinstance(dst, int):  # Switch-to-switch link
-            for link in initial_switch_links:
-                if {link[0][0], link[1][0]} == {src, dst}:
-                    is_valid_link = True
-                    port_no = (link[0][1] if link[0][0] == src else link[1][1])
-                    break
-        elif isinstance(src, str) or isinstance(dst, str):  # Host-to-switch link
-            for host_link in host_links_snapshot:
-                if (host_link["host_name"] == src and host_link["switch_dpid"] == dst) or \
-                   (host_link["host_name"] == dst and host_link["switch_dpid"] == src):
-                    is_valid_link = True
-                    port_no = host_link["port_no"]
-                    break
-
-        if is_valid_link:
-            # Adding the link to the graph
-            G.add_edge(src, dst)
-            print(f"Link added: {src} <-> {dst}")
-
-            # Updating topology data
-            if isinstance(src, int) and isinstance(dst, int):  # Switch-to-switch link
-                links.append(((src, port_no), (dst, None)))
-            elif isinstance(src, str) or isinstance(dst, str):  # Host-to-switch link
-                host_links.append({
-                    "host_name": src if isinstance(src, str) else dst,
-                    "switch_dpid": dst if isinstance(dst, int) else src,
-                    "port_no": port_no
-                })
-
-            # Redrawing the updated graph
-            visualize_topology(G, switches, links, host_links)
-        else:
-            src_type = "switch" if isinstance(src, int) else "host"
-            dst_type = "switch" if isinstance(dst, int) else "host"
-            print(f"src and dst not connected in original topology: {src_type} {src} and {dst_type} {dst}")
-    except ValueError:
-        print("Invalid input. Switch IDs must be integers, and host IDs must start with 'h'.")
+def index_host_links(host_links):
+    """Indexing host-to-switch links by (host name, switch DPID)."""
+    return {(host_link["host_name"], host_link["switch_dpid"]): host_link for host_link in host_links}
+
+
+def parse_node(node_id):
+    """Parsing a user-entered node ID into a (kind, value) tag, "h" for hosts and "s" for switches."""
+    if node_id.startswith("h"):  # Node is a host
+        return "h", node_id
+    return "s", int(node_id)  # Node is a switch
+
+
+def remove_link(G, source, destination, switches, links, host_links, all_hosts):
+    """Removing a link between two parsed (kind, value) nodes from the graph."""
+    src_kind, src = source
+    dst_kind, dst = destination
+
+    # Checking and removing link
+    if G.has_edge(src, dst):
+        G.remove_edge(src, dst)
+        print(f"Link removed: {src} <-> {dst}")
+
+        # Updating topology data
+        if src_kind == "s" and dst_kind == "s":  # Switch-to-switch link
+            links.pop(frozenset((src, dst)), None)
+        else:  # Host-to-switch link
+            host_links.pop((src, dst) if src_kind == "h" else (dst, src), None)
+
+            # Ensuring the host remains in the graph
+            if src_kind == "h" and src in all_hosts:
+                G.add_node(src)
+            if dst_kind == "h" and dst in all_hosts:
+                G.add_node(dst)
+
+        # Redrawing updated graph
+        visualize_topology(G, switches, links.values(), host_links.values(), rebuild_graph=False)
+    else:
+        print("Link does not exist in the current topology.")
+
+
+def add_link(G, source, destination, switches, links, host_links, switch_link_index, host_link_index):
+    """Adding a link between two parsed (kind, value) nodes to the graph."""
+    src_kind, src = source
+    dst_kind, dst = destination
+    is_switch_link = src_kind == "s" and dst_kind == "s"
+
+    # Checking if the link exists in the original topology or snapshot
+    is_valid_link = False
+    port_no = None
+    if is_switch_link:  # Switch-to-switch link
+        key = frozenset((src, dst))
+        link = switch_link_index.get(key)
+        if link is not None:
+            is_valid_link = True
+            port_no = (link[0][1] if link[0][0] == src else link[1][1])
+    else:  # Host-to-switch link
+        key = (src, dst) if src_kind == "h" else (dst, src)
+        host_link = host_link_index.get(key)
+        if host_link is not None:
+            is_valid_link = True
+            port_no = host_link["port_no"]
+
+    if is_valid_link:
+        # Adding the link to the graph
+        G.add_edge(src, dst)
+        print(f"Link added: {src} <-> {dst}")
+
+        # Updating topology data
+        if is_switch_link:  # Switch-to-switch link
+            links[key] = ((src, port_no), (dst, None))
+        else:  # Host-to-switch link
+            host_links[key] = {
+                "host_name": key[0],
+                "switch_dpid": key[1],
+                "port_no": port_no
+            }
+
+        # Redrawing the updated graph
+        visualize_topology(G, switches, links.values(), host_links.values(), rebuild_graph=False)
+    else:
+        src_type = "switch" if src_kind == "s" else "host"
+        dst_type = "switch" if dst_kind == "s" else "host"
+        print(f"src and dst not connected in original topology: {src_type} {src} and {dst_type} {dst}")
 
 
 def pingall(G, all_hosts):
@@ -224,17 +298,22 @@ def pingall(G, all_hosts):
     # Include all hosts
     hosts = sorted(all_hosts)
     total_pings = len(hosts) * (len(hosts) - 1)  # All pairwise pings
-    successful_pings = 0
+
+    # Grouping hosts by connected component, as hosts in the same component can reach each other
+    component_of = {}
+    for index, component in enumerate(nx.connected_components(G)):
+        for node in component:
+            component_of[node] = index
+    hosts_by_component = {}
+    for host in hosts:
+        if host in component_of:
+            hosts_by_component.setdefault(component_of[host], []).append(host)
+    successful_pings = sum(len(members) * (len(members) - 1) for members in hosts_by_component.values())
 
     print("\n=== Pingall Simulation ===")
     for src in hosts:
-        reachable = []
-        for dst in hosts:
-            if src != dst:
-                # Checking if the source and destination exist in the graph
-                if G.has_node(src) and G.has_node(dst) and nx.has_path(G, src, dst):
-                    reachable.append(dst)
-                    successful_pings += 1
+        members = hosts_by_component.get(component_of.get(src), [])
+        reachable = [dst for dst in members if dst != src]
         print(f"{src} -> {' '.join(reachable) if reachable else 'Unreachable'}")
 
     # Calculating packet loss
@@ -242,82 +321,180 @@ def pingall(G, all_hosts):
     print(f"*** Results: {packet_loss_percentage:.2f}% packet loss ({successful_pings}/{total_pings} received)")
 
 
-def visualize_topology(G, switches, links, host_links):
-    """Visualizing the network topology with hosts included."""
-    G.clear()
-    G.add_nodes_from(switches)
-
-    # Adding switch-to-switch links
+def refresh_figure():
+    """Scheduling a redraw and processing pending GUI events without sleeping like plt.pause."""
+    canvas = plt.gcf().canvas
+    canvas.draw_idle()
+    canvas.flush_events()
+
+
+def draw_animated_artists():
+    """Drawing the animated edges, nodes, labels and legend onto the canvas in z-order."""
+    fig = figure_artists["figure"]
+    for artist in figure_artists["animated"]:
+        fig.draw_artist(artist)
+
+
+def capture_background(event):
+    """Caching the static background after every full draw and drawing the animated artists on top."""
+    if figure_artists is None or event.canvas.figure is not figure_artists["figure"]:
+        return
+    if not event.canvas.supports_blit:
+        return
+    figure_artists["background"] = event.canvas.copy_from_bbox(event.canvas.figure.bbox)
+    draw_animated_artists()
+
+
+def blit_edges():
+    """Restoring the cached background and re-blitting the edges with the nodes drawn over them."""
+    canvas = figure_artists["figure"].canvas
+    if figure_artists["background"] is None:
+        canvas.draw()  # Triggers capture_background
+    else:
+        canvas.restore_region(figure_artists["background"])
+        draw_animated_artists()
+    canvas.blit(figure_artists["figure"].bbox)
+    canvas.flush_events()
+
+
+def add_edge_collection(ax, collection, segments):
+    """Adding an edge collection and padding the axes around it like nx.draw_networkx_edges does."""
+    ax.add_collection(collection)
+    if not segments:
+        return
+    xs = [point[0] for segment in segments for point in segment]
+    ys = [point[1] for segment in segments for point in segment]
+    pad_x = 0.05 * (max(xs) - min(xs))
+    pad_y = 0.05 * (max(ys) - min(ys))
+    ax.update_datalim([(min(xs) - pad_x, min(ys) - pad_y), (max(xs) + pad_x, max(ys) + pad_y)])
+    ax.autoscale_view()
+
+
+def visualize_topology(G, switches, links, host_links, rebuild_graph=True):
+    """
+    Visualizing the network topology with hosts included.
+    Callers that already edited G in place pass rebuild_graph=False to keep it as is.
+    """
+    global last_topology_signature, cached_layout, cached_layout_nodes, figure_artists
     graph_links = [(link[0][0], link[1][0]) for link in links]
-    G.add_edges_from(graph_links)
 
-    # Adding hosts and host-to-switch links
-    for host_link in host_links:
-        host_node = host_link["host_name"]
-        switch_node = host_link["switch_dpid"]
-        G.add_node(host_node)
-        G.add_edge(switch_node, host_node)
+    # Skipping the redraw if the topology did not change and is still shown in the current figure
+    signature = hash((
+        tuple(switches),
+        tuple(sorted(graph_links)),
+        tuple((host_link["host_name"], host_link["switch_dpid"]) for host_link in host_links),
+    ))
+    fig = plt.gcf()
+    if (signature == last_topology_signature and figure_artists is not None
+            and figure_artists["figure"] is fig):
+        fig.canvas.flush_events()
+        return
+    last_topology_signature = signature
+
+    if rebuild_graph:
+        G.clear()
+        G.add_nodes_from(switches)
+
+        # Adding switch-to-switch links
+        G.add_edges_from(graph_links)
+
+        # Adding hosts and host-to-switch links
+        for host_link in host_links:
+            host_node = host_link["host_name"]
+            switch_node = host_link["switch_dpid"]
+            G.add_node(host_node)
+            G.add_edge(switch_node, host_node)
+
+    # Recomputing the layout only when the set of nodes changes
+    nodes = frozenset(G.nodes)
+    layout_changed = nodes != cached_layout_nodes
+    if layout_changed:
+        cached_layout = nx.spring_layout(G, seed=42)
+        cached_layout_nodes = nodes
+    pos = cached_layout
 
-    # Ensuring isolated hosts are also in the graph
-    for node in G.nodes:
-        if isinstance(node, str) and node.startswith("h") and not list(G.neighbors(node)):
-            G.add_node(node)
+    host_links_edges = [(link["switch_dpid"], link["host_name"]) for link in host_links]
+    switch_segments = [(pos[u], pos[v]) for u, v in graph_links]
+    host_segments = [(pos[u], pos[v]) for u, v in host_links_edges]
+
+    host_nodes = [node for node in G.nodes if isinstance(node, str)]  # Only hosts are named by strings
+
+    # Only the edges changed: updating them in place and blitting over the cached background.
+    # Switch markers are drawn from switches rather than G, so those must match the drawn ones too
+    if (not layout_changed and figure_artists is not None
+            and figure_artists["figure"] is fig and fig.canvas.supports_blit
+            and figure_artists["switches"] == list(switches)
+            and figure_artists["host_nodes"] == host_nodes):
+        figure_artists["switch_edges"].set_segments(switch_segments)
+        figure_artists["host_edges"].set_segments(host_segments)
+        blit_edges()
+        return
 
     # Clearing the existing plot
     plt.clf()
+    ax = plt.gca()
 
-    pos = nx.spring_layout(G, seed=42)
-
-    nx.draw_networkx_nodes(
+    switch_node_artist = nx.draw_networkx_nodes(
         G, pos, nodelist=switches, node_size=700, node_color="lightblue", label="Switches"
     )
-    nx.draw_networkx_labels(
+    switch_label_artists = nx.draw_networkx_labels(
         G, pos, labels={node: f"S{node}" for node in switches}, font_weight="bold"
     )
-    nx.draw_networkx_edges(G, pos, edgelist=graph_links, width=1, edge_color="black", label="Links")
+    switch_edges = LineCollection(switch_segments, linewidths=1, colors="black", label="Links", zorder=1)
+    add_edge_collection(ax, switch_edges, switch_segments)
 
-    host_nodes = [node for node in G.nodes if isinstance(node, str) and node.startswith("h")]
-    nx.draw_networkx_nodes(
+    host_node_artist = nx.draw_networkx_nodes(
         G, pos, nodelist=host_nodes, node_size=300, node_color="green", label="Hosts"
     )
-    nx.draw_networkx_labels(
+    host_label_artists = nx.draw_networkx_labels(
         G, pos, labels={node: node for node in host_nodes}, font_size=8
     )
-    host_links_edges = [(link["switch_dpid"], link["host_name"]) for link in host_links]
-    nx.draw_networkx_edges(G, pos, edgelist=host_links_edges, edge_color="gray", style="dashed")
+    host_edges = LineCollection(host_segments, linewidths=1, colors="gray", linestyles="dashed", zorder=1)
+    add_edge_collection(ax, host_edges, host_segments)
 
     plt.title("Digital Twin - Network Topology")
     plt.axis("off")
-    plt.legend()
-    plt.pause(0.001)
+    legend = plt.legend()
+
+    # Animating everything that can overlap the edges, so blits redraw it above them in z-order
+    animated = [switch_edges, host_edges, switch_node_artist, host_node_artist, legend]
+    animated += list(switch_label_artists.values()) + list(host_label_artists.values())
+    # Empty node lists give collections that were never added to the axes, so they are skipped
+    animated = sorted(
+        (artist for artist in animated if artist is not None and artist.axes is not None),
+        key=lambda artist: artist.get_zorder(),
+    )
+    if fig.canvas.supports_blit:
+        for artist in animated:
+            artist.set_animated(True)
+
+    if figure_artists is None or figure_artists["figure"] is not fig:
+        fig.canvas.mpl_connect("draw_event", capture_background)
+    figure_artists = {
+        "figure": fig,
+        "switch_edges": switch_edges,
+        "host_edges": host_edges,
+        "switches": list(switches),
+        "host_nodes": host_nodes,
+        "animated": animated,
+        "background": None,
+    }
+    refresh_figure()
 
 
 def initialize_host_mapping(links, hosts):
     """
     Initializing the host-to-switch mapping.
     """
-    # Deduplicate switch-to-switch links
-    switch_ports = {}
-    for link in links:
-        src_dpid = link["src"]["dpid"]
-        src_port = link["src"]["port_no"]
-        dst_dpid = link["dst"]["dpid"]
-        dst_port = link["dst"]["port_no"]
-
-        if src_dpid not in switch_ports:
-            switch_ports[src_dpid] = set()
-        if dst_dpid not in switch_ports:
-            switch_ports[dst_dpid] = set()
-
-        switch_ports[src_dpid].add(src_port)
-        switch_ports[dst_dpid].add(dst_port)
+    # Collecting ports used by switch-to-switch links
+    switch_ports = get_switch_ports(links)
 
     # Mapping hosts to switches
     host_links = []
     host_counter = 1
-    for host in sorted(hosts, key=lambda h: (int(h["attached_switch"]), int(h["attached_port"]))):
-        switch_id = int(host["attached_switch"])
-        port_no = int(host["attached_port"])
+    for host in sorted(hosts, key=itemgetter("attached_switch", "attached_port")):
+        switch_id = host["attached_switch"]
+        port_no = host["attached_port"]
 
         # Excluding ports used for switch-to-switch links
         if switch_id in switch_ports and port_no in switch_ports[switch_id]:
@@ -336,14 +513,21 @@ def initialize_host_mapping(links, hosts):
     return host_links
 
 
+def notify_update():
+    """Waking up the main loop by writing a byte to the wakeup pipe."""
+    try:
+        os.write(wakeup_write_fd, b"\0")
+    except BlockingIOError:
+        pass  # The pipe is already full of pending wakeups
+
+
 def real_time_update():
     """
     Continuously fetching real-time updates, updating the switch-to-switch links, and re-drawing the graph.
     """
     global initial_host_mapping, initial_switch_links
     print("\nReal-time fetching and synchronization active...")
-    switches, links = fetch_topology()
-    hosts = fetch_hosts()
+    switches, links, hosts = fetch_all()
 
     # Initializing the host and switch mapping if not already set
     if initial_host_mapping is None:
@@ -353,26 +537,18 @@ def real_time_update():
 
     while not stop_real_time.is_set():
         # Fetching updated switch-to-switch links
-        switches, links = fetch_topology()
+        switches, links, _ = fetch_all(include_hosts=False)
         deduplicated_links = deduplicate_links(links)
 
         # Using the initial host mapping
         current_host_links = initial_host_mapping
 
-        # Updating the graph visualization
+        # Updating the graph visualization, replacing any update the consumer has not drawn yet
         fetch_queue.put((switches, deduplicated_links, current_host_links))
+        notify_update()
         time.sleep(1)  # Fetch updates every 1 second
 
 
-def is_enter_pressed():
-    """Checking if the Enter key is pressed."""
-    if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
-        line = sys.stdin.read(1)
-        if line.strip() == "":
-            return True
-    return False
-
-
 if __name__ == "__main__":
     plt.ion()
     G = nx.Graph()
@@ -390,26 +566,34 @@ if __name__ == "__main__":
             real_time_thread.start()
 
             print("Press Enter to stop real-time fetching and switch to snapshot mode...")
+            # Blocking until either the Enter key is pressed or the fetcher queues an update
+            selector = selectors.DefaultSelector()
+            selector.register(sys.stdin, selectors.EVENT_READ)
+            selector.register(wakeup_read_fd, selectors.EVENT_READ)
             while not stop_real_time.is_set():
-                if is_enter_pressed():
-                    print("\nReal-time fetching stopped. You can now interact with the snapshot.")
-                    stop_real_time.set()
-                try:
-                    switches, links, host_links = fetch_queue.get(timeout=1)
-                    visualize_topology(G, switches, links, host_links)
-                except queue.Empty:
-                    pass
+                for key, _ in selector.select():
+                    if key.fileobj is sys.stdin:
+                        if sys.stdin.readline().strip() == "":
+                            print("\nReal-time fetching stopped. You can now interact with the snapshot.")
+                            stop_real_time.set()
+                        continue
+
+                    os.read(wakeup_read_fd, 1024)
+                    # Only the newest update is kept, so drawing it brings the view up to date
+                    latest = fetch_queue.get(timeout=0)
+                    if latest:
+                        visualize_topology(G, *latest)
+            selector.close()
 
         elif mode == "snapshot":
             print("Capturing snapshot...")
-            switches, links = fetch_topology()
-            hosts = fetch_hosts()
+            switches, links, hosts = fetch_all()
 
             deduplicated_links = deduplicate_links(links)
 
             # Using initial_host_mapping if available; otherwise, generate it
             if initial_host_mapping is None:
-                initial_host_mapping = initialize_host_mapping(deduplicated_links, hosts)
+                initial_host_mapping = initialize_host_mapping(links, hosts)
 
             host_links = initial_host_mapping  # Always using the saved mapping
 
@@ -442,11 +626,17 @@ if __name__ == "__main__":
                     if isinstance(node, str) and node.startswith("h") and node not in all_hosts:
                         all_hosts.append(node)
 
-                # Saving original snapshots for reference
-                links_snapshot = list(links)
-                host_links_snapshot = list(host_links)
+                # Saving indexed original snapshots for reference
+                switch_link_index = index_switch_links(
+                    initial_switch_links if initial_switch_links is not None else links
+                )
+                host_link_index = index_host_links(host_links)
+
+                # Keeping the editable topology indexed as well
+                links = index_switch_links(links)
+                host_links = dict(host_link_index)
 
-                visualize_topology(G, switches, links, host_links)
+                visualize_topology(G, switches, links.values(), host_links.values())
 
                 while True:
                     action = input("\nChoose action: link (link), pingall (pingall), or exit replay (exit): ").strip().lower()
@@ -456,10 +646,18 @@ if __name__ == "__main__":
                         source = input("Enter source node ID (e.g., '1' for Switch 1 or 'h1' for Host 1): ").strip()
                         destination = input("Enter destination node ID (e.g., '2' for Switch 2 or 'h2' for Host 2): ").strip()
 
+                        # Parsing the node types once at the input boundary
+                        try:
+                            source = parse_node(source)
+                            destination = parse_node(destination)
+                        except ValueError:
+                            print("Invalid input. Switch IDs must be integers, and host IDs must start with 'h'.")
+                            continue
+
                         if link_action == "down":
                             remove_link(G, source, destination, switches, links, host_links, all_hosts)
                         elif link_action == "up":
-                            add_link(G, source, destination, switches, links, host_links, host_links_snapshot)
+                            add_link(G, source, destination, switches, links, host_links, switch_link_index, host_link_index)
                         else:
                             print("Invalid option. Please choose 'up' or 'down'.")
                     elif action == "pingall":